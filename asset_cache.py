@@ -0,0 +1,311 @@
+"""
+Content-addressed diagram cache for Docify
+Class diagrams and dependency graphs are rendered in a process pool and reused across builds and repositories
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+# Bump when rendering output changes so stale cached images are not reused
+RENDERER_VERSION = 2
+
+ASSET_CACHE_DIR = Path(
+    os.getenv("DOCIFY_ASSET_CACHE_DIR", Path.home() / ".cache" / "docify" / "assets")
+)
+
+# Size caps for emitted assets; larger PNGs are downscaled until they fit,
+# larger SVGs are rejected
+MAX_ASSET_BYTES = int(os.getenv("DOCIFY_MAX_ASSET_KB", "256")) * 1024
+MAX_IMAGE_PIXELS = 1600
+MIN_IMAGE_PIXELS = 320
+
+ASSET_FORMATS = ("png", "svg")
+
+# Render processes per server process; each warm-pool worker has its own pool
+MAX_RENDER_WORKERS = int(os.getenv("DOCIFY_RENDER_WORKERS", "2"))
+
+# Graph size caps; bigger diagrams are unreadable at MAX_IMAGE_PIXELS anyway
+MAX_NODES = 300
+MAX_EDGES = 1000
+MAX_LABEL_LENGTH = 120
+
+# Inclusive (min, max) of the numeric style keys
+STYLE_RANGES = {"dpi": (50, 300), "font_size": (4, 32)}
+COLOR_PATTERN = re.compile(r"#(?:[0-9a-fA-F]{3}){1,2}")
+
+DEFAULT_STYLE = {
+    "dpi": 100,
+    "font_size": 8,
+    "node_color": "#f4e1e4",
+    "edge_color": "#8a8a8a",
+    "text_color": "#1a1a1a",
+    "background": "#ffffff",
+}
+
+def node_label(node):
+    """Return the label of a node given as a string or integer."""
+    if isinstance(node, bool) or not isinstance(node, (str, int)):
+        raise ValueError("nodes must be strings or integers")
+    label = str(node)
+    if not label or len(label) > MAX_LABEL_LENGTH:
+        raise ValueError(f"node labels must be 1 to {MAX_LABEL_LENGTH} characters")
+    return label
+
+def normalize_style(style):
+    """Validate style overrides and return the complete style."""
+    if not isinstance(style, dict) or set(style) - set(DEFAULT_STYLE):
+        raise ValueError(f"style keys must be among {', '.join(DEFAULT_STYLE)}")
+    style = {**DEFAULT_STYLE, **style}
+    for key, (low, high) in STYLE_RANGES.items():
+        value = style[key]
+        if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+            raise ValueError(f"style.{key} must be an integer from {low} to {high}")
+    for key in DEFAULT_STYLE.keys() - STYLE_RANGES.keys():
+        if not isinstance(style[key], str) or not COLOR_PATTERN.fullmatch(style[key]):
+            raise ValueError(f"style.{key} must be a hex color such as #1a1a1a")
+        style[key] = style[key].lower()
+    return style
+
+def normalize_spec(spec):
+    """Validate a diagram spec and return it in canonical form.
+
+    A spec is {"graph": {"nodes": [...], "edges": [[src, dst], ...]},
+    "style": {...}, "format": "png" | "svg"}. Nodes and edges are sorted
+    and de-duplicated so equivalent graphs hash (and render) identically.
+    """
+    graph = spec.get("graph")
+    if not isinstance(graph, dict):
+        raise ValueError("graph must be an object with nodes and edges")
+    fmt = spec.get("format", "png")
+    if fmt not in ASSET_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(ASSET_FORMATS)}")
+    style = normalize_style(spec.get("style", {}))
+
+    raw_nodes = graph.get("nodes", [])
+    raw_edges = graph.get("edges", [])
+    if not isinstance(raw_nodes, list) or not isinstance(raw_edges, list):
+        raise ValueError("nodes and edges must be lists")
+    if len(raw_edges) > MAX_EDGES:
+        raise ValueError(f"At most {MAX_EDGES} edges per diagram")
+    if len(raw_nodes) > MAX_NODES:
+        raise ValueError(f"At most {MAX_NODES} nodes per diagram")
+
+    edges = set()
+    for edge in raw_edges:
+        if not isinstance(edge, (list, tuple)) or len(edge) != 2:
+            raise ValueError("edges must be [source, target] pairs")
+        edges.add((node_label(edge[0]), node_label(edge[1])))
+    nodes = {node_label(node) for node in raw_nodes}
+    nodes.update(node for edge in edges for node in edge)
+    if len(nodes) > MAX_NODES:
+        raise ValueError(f"At most {MAX_NODES} nodes per diagram")
+
+    return {
+        "graph": {"nodes": sorted(nodes), "edges": [list(edge) for edge in sorted(edges)]},
+        "style": style,
+        "format": fmt,
+    }
+
+def asset_key(spec):
+    """Hash of a normalized spec's graph, style, format and renderer version."""
+    canonical = json.dumps(
+        {**spec, "renderer_version": RENDERER_VERSION},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def asset_path(key, fmt, cache_dir=ASSET_CACHE_DIR):
+    """Location of a cached asset, sharded by the first two hex digits."""
+    return Path(cache_dir) / key[:2] / f"{key}.{fmt}"
+
+def layered_layout(nodes, edges):
+    """Place nodes in columns by longest-path dependency depth in O(N + E).
+
+    Nodes are layered in topological order. When only cycles remain, the
+    first unplaced node in input order is placed next, which breaks the cycle
+    deterministically.
+    """
+    successors = {node: [] for node in nodes}
+    indegree = dict.fromkeys(nodes, 0)
+    for src, dst in edges:
+        if src != dst:
+            successors[src].append(dst)
+            indegree[dst] += 1
+
+    depth = dict.fromkeys(nodes, 0)
+    ready = deque(node for node in nodes if not indegree[node])
+    unplaced = iter(nodes)
+    placed = set()
+    while len(placed) < len(nodes):
+        if not ready:
+            ready.append(next(node for node in unplaced if node not in placed))
+        node = ready.popleft()
+        if node in placed:
+            continue
+        placed.add(node)
+        for dst in successors[node]:
+            if dst not in placed:
+                depth[dst] = max(depth[dst], depth[node] + 1)
+                indegree[dst] -= 1
+                if not indegree[dst]:
+                    ready.append(dst)
+
+    columns = {}
+    for node in nodes:
+        columns.setdefault(depth[node], []).append(node)
+    positions = {}
+    for x, column in enumerate(sorted(columns)):
+        members = columns[column]
+        for y, node in enumerate(members):
+            positions[node] = (x, (len(members) - 1) / 2 - y)
+    return positions
+
+def render_asset(spec, path, max_bytes=MAX_ASSET_BYTES):
+    """Render a normalized spec to path. Runs in a worker process."""
+    from matplotlib import rc_context
+    from matplotlib.figure import Figure
+
+    style = spec["style"]
+    nodes = spec["graph"]["nodes"]
+    edges = spec["graph"]["edges"]
+    positions = layered_layout(nodes, edges)
+
+    column_sizes = Counter(x for x, _ in positions.values())
+    columns = max(column_sizes, default=0) + 1
+    rows = max(column_sizes.values(), default=1)
+    max_inches = MAX_IMAGE_PIXELS / style["dpi"]
+    fig = Figure(
+        figsize=(min(2.2 * columns + 1, max_inches), min(0.5 * rows + 1, max_inches)),
+        dpi=style["dpi"],
+        facecolor=style["background"],
+    )
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+
+    for src, dst in edges:
+        ax.annotate(
+            "",
+            xy=positions[dst],
+            xytext=positions[src],
+            arrowprops={"arrowstyle": "->", "color": style["edge_color"], "lw": 0.8},
+        )
+    for node, (x, y) in positions.items():
+        ax.text(
+            x, y, node,
+            ha="center", va="center",
+            fontsize=style["font_size"],
+            color=style["text_color"],
+            bbox={"boxstyle": "round", "facecolor": style["node_color"], "edgecolor": style["edge_color"]},
+        )
+    ax.set_xlim(-0.7, columns - 0.3)
+    ax.set_ylim(-rows / 2 - 0.2, rows / 2 + 0.2)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if spec["format"] == "svg":
+        # Text as <text> elements instead of glyph paths, and no timestamp
+        with rc_context({"svg.fonttype": "none", "svg.hashsalt": "docify"}):
+            fig.savefig(tmp_path, format="svg", metadata={"Date": None})
+        if os.path.getsize(tmp_path) > max_bytes:
+            os.remove(tmp_path)
+            raise ValueError(
+                f"SVG exceeds {max_bytes // 1024} KB; use png or a smaller graph"
+            )
+    else:
+        fig.savefig(tmp_path, format="png", facecolor=style["background"])
+        optimize_png(tmp_path, max_bytes)
+    # Atomic so concurrent builds never read a partially written asset
+    os.replace(tmp_path, path)
+    return str(path)
+
+def optimize_png(path, max_bytes=MAX_ASSET_BYTES):
+    """Quantize a PNG to a palette and downscale it until it fits max_bytes."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+    image.thumbnail((MAX_IMAGE_PIXELS, MAX_IMAGE_PIXELS))
+
+    while True:
+        # Diagrams use few flat colors, so a palette loses little detail
+        image.quantize(colors=256).save(path, format="PNG", optimize=True)
+        if os.path.getsize(path) <= max_bytes or max(image.size) <= MIN_IMAGE_PIXELS:
+            return
+        image = image.resize(
+            (max(1, int(image.width * 0.75)), max(1, int(image.height * 0.75))),
+            Image.LANCZOS,
+        )
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Process pool shared by all renders in this process, created on first use.
+
+    Render processes come from a forkserver rather than forking the server,
+    which is multithreaded and could deadlock in a forked child. The
+    forkserver preloads the plotting libraries once for every render process.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            if "forkserver" in methods:
+                context.set_forkserver_preload(["asset_cache", "matplotlib.figure", "PIL.Image"])
+            _executor = ProcessPoolExecutor(max_workers=MAX_RENDER_WORKERS, mp_context=context)
+        return _executor
+
+def discard_executor(executor):
+    """Drop a broken pool so the next get_executor call starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def render_pending(pending):
+    """Render (spec, path) pairs in the pool and wait for all of them."""
+    executor = get_executor()
+    try:
+        futures = [executor.submit(render_asset, spec, path) for spec, path in pending]
+        for future in futures:
+            future.result()
+    except BrokenProcessPool:
+        discard_executor(executor)
+        raise
+
+def render_assets(specs, cache_dir=ASSET_CACHE_DIR):
+    """Render diagram specs, reusing cached outputs by content hash.
+
+    Returns one {"key", "format", "path", "cached"} dict per spec, in order.
+    Identical specs in a call are rendered once; misses render in parallel,
+    always in the pool so plotting libraries stay out of the server process.
+    """
+    normalized = [normalize_spec(spec) for spec in specs]
+    results = []
+    pending = {}
+    for spec in normalized:
+        key = asset_key(spec)
+        path = asset_path(key, spec["format"], cache_dir)
+        cached = path.exists()
+        if not cached and key not in pending:
+            pending[key] = (spec, path)
+        results.append({"key": key, "format": spec["format"], "path": str(path), "cached": cached})
+
+    try:
+        render_pending(list(pending.values()))
+    except BrokenProcessPool:
+        # A render process died (OOM kill, crash); retry the rest once in a new pool
+        render_pending([(spec, path) for spec, path in pending.values() if not path.exists()])
+    return results
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Docify servers using python -X importtime
+Fails when import time regresses or heavy dependencies load at startup
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+
+# Modules that must only be imported on first use, never at server startup
+HEAVY_MODULES = [
+    "numpy",
+    "matplotlib",
+    "PIL",
+    "boto3",
+    "openai",
+    "google.generativeai",
+    "google.genai",
+    "tree_sitter",
+    "multiprocessing",
+]
+
+# Server modules to benchmark and their cumulative import budget
+STARTUP_MODULES = ["premium_demo", "demo_server"]
+MAX_IMPORT_SECONDS = float(os.getenv("DOCIFY_MAX_IMPORT_SECONDS", "1.5"))
+
+def measure_import(module):
+    """Import a module in a fresh interpreter and parse the -X importtime report.
+
+    Returns (total_seconds, {module_name: cumulative_seconds}).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit code {result.returncode}")
+
+    total_us = 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports are not indented; nested ones are
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        modules[name.strip()] = int(cumulative) / 1_000_000
+    return total_us / 1_000_000, modules
+
+def test_startup():
+    """Check import time and heavy-module leaks for each server module."""
+    print(f"⏱️  Import budget: {MAX_IMPORT_SECONDS:.2f}s per server module")
+    success = True
+
+    for module in STARTUP_MODULES:
+        print(f"\n📦 {module}")
+        try:
+            total, modules = measure_import(module)
+        except RuntimeError as e:
+            print(f"   ❌ Import failed: {e}")
+            success = False
+            continue
+
+        status = "✅" if total <= MAX_IMPORT_SECONDS else "❌"
+        print(f"   {status} Import time: {total:.3f}s ({len(modules)} modules)")
+        success = success and total <= MAX_IMPORT_SECONDS
+
+        leaked = [
+            name for name in HEAVY_MODULES
+            if name in modules or any(m.startswith(name + ".") for m in modules)
+        ]
+        if leaked:
+            print(f"   ❌ Heavy modules imported at startup: {', '.join(leaked)}")
+            success = False
+        else:
+            print(f"   ✅ No heavy modules imported at startup")
+
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+        for name, seconds in slowest:
+            print(f"      {seconds * 1000:8.1f}ms  {name}")
+
+    return success
+
+if __name__ == "__main__":
+    print("🚀 Benchmarking Docify startup imports...")
+    print("=" * 50)
+
+    success = test_startup()
+
+    print("=" * 50)
+    if success:
+        print("🎉 Startup is within budget!")
+    else:
+        print("⚠️  Startup benchmark failed")
+
+    exit(0 if success else 1)
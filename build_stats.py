@@ -0,0 +1,130 @@
+"""
+Per-build symbol statistics for Docify
+Aggregates the symbol table with vectorized NumPy group-bys instead of Python loops
+"""
+
+import numpy as np
+
+# Lower bin edges for the complexity histogram; each bin runs up to the next edge and the last is open-ended
+COMPLEXITY_BINS = [1, 2, 3, 5, 8, 13, 21]
+COMPLEXITY_PERCENTILES = [50, 90, 99]
+
+class SymbolTable:
+    """Columnar symbol table with one array per field.
+
+    Languages and modules are stored as integer codes into the languages and
+    modules name lists, so group-bys are plain bincounts.
+    """
+
+    def __init__(self, languages, language_codes, modules, module_codes,
+                 has_docstring, complexity, lines):
+        self.languages = list(languages)
+        self.language_codes = np.asarray(language_codes, dtype=np.int64)
+        self.modules = list(modules)
+        self.module_codes = np.asarray(module_codes, dtype=np.int64)
+        self.has_docstring = np.asarray(has_docstring, dtype=bool)
+        self.complexity = np.asarray(complexity, dtype=np.int64)
+        self.lines = np.asarray(lines, dtype=np.int64)
+
+    @classmethod
+    def from_columns(cls, language, module, has_docstring, complexity, lines):
+        """Build a table from per-symbol columns, factorizing the name columns."""
+        languages, language_codes = np.unique(np.asarray(language, dtype=str), return_inverse=True)
+        modules, module_codes = np.unique(np.asarray(module, dtype=str), return_inverse=True)
+        return cls(
+            languages.tolist(), language_codes,
+            modules.tolist(), module_codes,
+            has_docstring, complexity, lines,
+        )
+
+    def __len__(self):
+        return len(self.language_codes)
+
+def grouped_percentiles(codes, values, counts, percentiles):
+    """Nearest-rank percentiles of values per group, for every group at once.
+
+    Returns an array of shape (len(counts), len(percentiles)); empty groups are 0.
+    """
+    if not len(values):
+        return np.zeros((len(counts), len(percentiles)), dtype=np.int64)
+
+    # One sort on a combined (group, value) key orders values within each group
+    offset = values.min()
+    span = values.max() - offset + 1
+    ordered = np.sort(codes * span + (values - offset)) % span + offset
+
+    starts = np.cumsum(counts) - counts
+    ranks = np.ceil(np.outer(counts, percentiles) / 100).astype(np.int64) - 1
+    index = np.clip(starts[:, None] + np.maximum(ranks, 0), 0, len(ordered) - 1)
+    result = ordered[index]
+    result[counts == 0] = 0
+    return result
+
+def compute_stats(table, top_modules=10):
+    """Aggregate symbols per language, docstring coverage, complexity and module size."""
+    n_languages = len(table.languages)
+    lang = table.language_codes
+
+    symbols = np.bincount(lang, minlength=n_languages)
+    documented = np.bincount(lang, weights=table.has_docstring, minlength=n_languages)
+    complexity_sum = np.bincount(lang, weights=table.complexity, minlength=n_languages)
+    lines = np.bincount(lang, weights=table.lines, minlength=n_languages)
+    # The 100th percentile is the per-language maximum
+    percentiles = grouped_percentiles(
+        lang, table.complexity, symbols, COMPLEXITY_PERCENTILES + [100]
+    )
+    complexity_max = percentiles[:, -1]
+
+    safe = np.maximum(symbols, 1)
+    coverage = documented / safe * 100
+    mean_complexity = complexity_sum / safe
+
+    by_language = []
+    for i in np.argsort(-symbols, kind="stable"):
+        if not symbols[i]:
+            continue
+        by_language.append({
+            "language": table.languages[i],
+            "symbols": int(symbols[i]),
+            "lines": int(lines[i]),
+            "docstring_coverage_percent": round(float(coverage[i]), 1),
+            "complexity": {
+                "mean": round(float(mean_complexity[i]), 2),
+                **{f"p{p}": int(v) for p, v in zip(COMPLEXITY_PERCENTILES, percentiles[i])},
+                "max": int(complexity_max[i]),
+            },
+        })
+
+    # Histogram over [1], [2], [3, 4], [5, 7], ... and the open-ended last bin
+    bins = np.searchsorted(COMPLEXITY_BINS, table.complexity, side="right")
+    histogram = np.bincount(bins, minlength=len(COMPLEXITY_BINS) + 1)
+    labels = ["<1"] + [
+        f"{low}" if high - low == 1 else f"{low}-{high - 1}"
+        for low, high in zip(COMPLEXITY_BINS, COMPLEXITY_BINS[1:])
+    ] + [f"{COMPLEXITY_BINS[-1]}+"]
+
+    n_modules = len(table.modules)
+    module_lines = np.bincount(table.module_codes, weights=table.lines, minlength=n_modules)
+    module_symbols = np.bincount(table.module_codes, minlength=n_modules)
+    k = min(top_modules, n_modules)
+    top = np.argpartition(-module_lines, k - 1)[:k] if k else np.array([], dtype=np.int64)
+    top = top[np.argsort(-module_lines[top], kind="stable")]
+
+    total = len(table)
+    return {
+        "total_symbols": total,
+        "total_modules": int(np.count_nonzero(module_symbols)),
+        "docstring_coverage_percent": round(float(table.has_docstring.sum()) / max(total, 1) * 100, 1),
+        "by_language": by_language,
+        "complexity_distribution": {
+            label: int(count) for label, count in zip(labels, histogram)
+        },
+        "largest_modules": [
+            {
+                "module": table.modules[i],
+                "lines": int(module_lines[i]),
+                "symbols": int(module_symbols[i]),
+            }
+            for i in top
+        ],
+    }
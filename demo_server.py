@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 from datetime import datetime
 import json
 
@@ -318,4 +317,6 @@ if __name__ == "__main__":
     print("📊 Demo server with mock data and real UI")
     print("🌐 Open http://127.0.0.1:8000 in your browser")
     
+    import uvicorn
+
     uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Mock job store for the Docify demo server
+Jobs follow a fixed stage timeline and are evicted once they have been finished for a while
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+
+# Simulated pipeline stages: (status, progress, seconds spent in stage)
+JOB_STAGES = [
+    ("queued", 0, 2),
+    ("cloning", 10, 4),
+    ("analyzing", 30, 8),
+    ("generating", 55, 10),
+    ("building", 80, 6),
+    ("success", 100, None),
+]
+
+PIPELINE_SECONDS = sum(duration for _, _, duration in JOB_STAGES if duration)
+
+# Builds that run at once across every job and batch; the rest wait for a free slot
+BUILD_SLOTS = os.cpu_count() or 1
+
+# Seconds a finished job or batch stays queryable before it is evicted
+JOB_RETENTION_SECONDS = int(os.getenv("DOCIFY_JOB_RETENTION_SECONDS", "3600"))
+
+# Seconds between eviction sweeps
+EVICTION_INTERVAL_SECONDS = 60
+
+# scp-style git remotes: [user@]host:path
+SCP_URL_PATTERN = re.compile(r"^(?:[^@/:]+@)?([^@/:]+):(.+)$")
+
+def mirror_key(repo_url):
+    """Normalize a repository URL so duplicates share one clone mirror.
+
+    https, ssh and scp-style (git@host:org/repo) URLs of a repository map to
+    the same host/path key. Only the host is case-insensitive.
+    """
+    url = repo_url.strip()
+    match = None if "://" in url else SCP_URL_PATTERN.match(url)
+    if match:
+        host, path = match.groups()
+    else:
+        # Scheme-less URLs such as github.com/org/repo
+        parts = urllib.parse.urlsplit(url if "://" in url else f"//{url}")
+        host, path = parts.hostname or "", parts.path
+    path = path.strip("/").removesuffix(".git").rstrip("/")
+    return f"{host.lower()}/{path}"
+
+def job_stage(job, now=None):
+    """Return (status, progress) for a job based on its elapsed time."""
+    elapsed = (time.monotonic() if now is None else now) - job["started"]
+    for status, progress, duration in JOB_STAGES:
+        if duration is None or elapsed < duration:
+            return status, progress
+        elapsed -= duration
+
+class JobStore:
+    """In-memory jobs and batches.
+
+    Job records never change after creation; a job's status is derived from
+    its start time. Each job starts on the earliest free of a fixed number of
+    build slots, so overlapping batches and single jobs queue behind each other.
+    Methods are thread-safe and return copies, so the store can also be
+    served to other processes by a multiprocessing manager.
+    """
+
+    def __init__(self, retention=JOB_RETENTION_SECONDS, slots=BUILD_SLOTS, clock=time.monotonic):
+        self.retention = retention
+        self.slots = slots
+        self._clock = clock
+        # Time each build slot becomes free, as a min-heap
+        self._free_at = [clock()] * slots
+        self._jobs = {}
+        # batch_id -> {"job_ids": [...], "finishes_at": ...}
+        self._batches = {}
+        self._lock = threading.Lock()
+        self._next_eviction = clock() + EVICTION_INTERVAL_SECONDS
+
+    def create_job(self, repository_url, documentation_url):
+        """Record a job that starts on the next free build slot."""
+        return self.create_jobs([(repository_url, documentation_url)])[0]
+
+    def create_jobs(self, entries):
+        """Record several jobs at once, one per (repository_url, documentation_url).
+
+        One call per batch keeps the cost to a single round trip when the
+        store is served by a multiprocessing manager.
+        """
+        with self._lock:
+            return self._insert_jobs(entries)
+
+    def create_batch(self, entries):
+        """Record a batch's jobs and the batch itself. Returns (batch_id, jobs)."""
+        with self._lock:
+            jobs = self._insert_jobs(entries)
+            batch_id = self._insert_batch([job["job_id"] for job in jobs])
+        return batch_id, jobs
+
+    def get_job(self, job_id):
+        """Return a copy of a job record, or None if unknown or evicted."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def add_batch(self, job_ids):
+        """Group existing jobs into a batch and return its id."""
+        with self._lock:
+            return self._insert_batch(job_ids)
+
+    def _insert_jobs(self, entries):
+        """Store new job records and return copies. Caller holds the lock."""
+        self._evict_finished()
+        now = self._clock()
+        jobs = []
+        for repository_url, documentation_url in entries:
+            started = max(self._free_at[0], now)
+            heapq.heapreplace(self._free_at, started + PIPELINE_SECONDS)
+            job = {
+                "job_id": uuid.uuid4().hex[:8],
+                "repository_url": repository_url,
+                "documentation_url": documentation_url,
+                "started": started,
+            }
+            self._jobs[job["job_id"]] = job
+            jobs.append(dict(job))
+        return jobs
+
+    def _insert_batch(self, job_ids):
+        """Store a batch of existing jobs and return its id. Caller holds the lock."""
+        batch_id = uuid.uuid4().hex[:8]
+        finishes_at = max(self._jobs[job_id]["started"] for job_id in job_ids) + PIPELINE_SECONDS
+        self._batches[batch_id] = {"job_ids": list(job_ids), "finishes_at": finishes_at}
+        return batch_id
+
+    def get_batch(self, batch_id):
+        """Return copies of a batch's job records, or None if unknown or evicted.
+
+        Jobs that finished early may already be evicted; they are returned as
+        None and count as successful.
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            return [
+                dict(self._jobs[job_id]) if job_id in self._jobs else None
+                for job_id in batch["job_ids"]
+            ]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def _evict_finished(self, force=False):
+        """Drop jobs and batches finished more than retention seconds ago. Caller holds the lock."""
+        now = self._clock()
+        if not force and now < self._next_eviction:
+            return
+        self._next_eviction = now + EVICTION_INTERVAL_SECONDS
+        cutoff = now - self.retention - PIPELINE_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items() if job["started"] < cutoff]:
+            del self._jobs[job_id]
+        cutoff = now - self.retention
+        for batch_id in [b for b, batch in self._batches.items() if batch["finishes_at"] < cutoff]:
+            del self._batches[batch_id]
+
+    def evict_finished(self):
+        """Run an eviction sweep now."""
+        with self._lock:
+            self._evict_finished(force=True)
@@ -4,30 +4,129 @@ Premium SaaS Demo Server for Docify
 Enhanced with Gemini AI integration and premium features
 """
 
-import asyncio
+import functools
+import hashlib
+import importlib
+import json
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-import uvicorn
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-# Try to import settings, fallback to mock if not available
+from job_store import (
+    BUILD_SLOTS,
+    JOB_RETENTION_SECONDS,
+    JOB_STAGES,
+    PIPELINE_SECONDS,
+    JobStore,
+    job_stage,
+    mirror_key,
+)
+from search_index import SearchIndex
+
 try:
-    from docify.config import settings
+    import orjson
 except ImportError:
-    print("⚠️  docify.config not found, using mock settings")
-    class MockSettings:
-        gemini_api_key = os.getenv("GEMINI_API_KEY")
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-    settings = MockSettings()
+    orjson = None
+
+# Heavy dependencies (settings, tree-sitter grammars, AI clients, plotting) are
+# imported on first use so that workers start with only the request path loaded.
+
+class MockSettings:
+    """Fallback settings read straight from the environment."""
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+
+@functools.lru_cache(maxsize=None)
+def get_settings():
+    """Load docify settings, falling back to mock settings if not available."""
+    try:
+        from docify.config import settings
+    except ImportError:
+        print("⚠️  docify.config not found, using mock settings")
+        return MockSettings()
+    return settings
+
+# Tree-sitter grammar packages by language name
+GRAMMAR_MODULES = {
+    "python": "tree_sitter_python",
+    "javascript": "tree_sitter_javascript",
+    "typescript": "tree_sitter_typescript",
+    "java": "tree_sitter_java",
+    "go": "tree_sitter_go",
+    "rust": "tree_sitter_rust",
+    "cpp": "tree_sitter_cpp",
+}
+
+@functools.lru_cache(maxsize=None)
+def get_language(name):
+    """Load the tree-sitter Language for a grammar on first use."""
+    from tree_sitter import Language
+
+    grammar = importlib.import_module(GRAMMAR_MODULES[name])
+    if name == "typescript":
+        return Language(grammar.language_typescript(), name)
+    return Language(grammar.language(), name)
+
+@functools.lru_cache(maxsize=None)
+def get_ai_client():
+    """Create the Gemini client on first use, or None if no key is configured."""
+    api_key = get_settings().gemini_api_key
+    if not api_key:
+        return None
+
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel("gemini-pro")
+
+def dumps_json(payload):
+    """Serialize a payload to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+def make_etag(body):
+    """Strong ETag derived from the serialized response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+# Pre-serialized hot responses: key -> (expires_at, body, etag)
+_response_cache = {}
+
+def cached_json(key, ttl, build):
+    """Return (body, etag) for key, rebuilding the payload once ttl expires."""
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] <= now:
+        body = dumps_json(build())
+        entry = (now + ttl, body, make_etag(body))
+        _response_cache[key] = entry
+    return entry[1], entry[2]
+
+def json_response(request, body, etag, max_age=0):
+    """Serve pre-serialized JSON, answering 304 when If-None-Match matches."""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"max-age={max_age}" if max_age else "no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Seconds that /health and /api/v1/status payloads are reused for
+STATUS_CACHE_TTL = 5
 
 # Initialize FastAPI app with premium configuration
 app = FastAPI(
@@ -38,11 +137,13 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Mount static files (the demo assets are not part of every checkout)
+static_dir = project_root / "static"
+if static_dir.is_dir():
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 # Initialize templates
-templates = Jinja2Templates(directory="templates")
+templates = Jinja2Templates(directory=project_root / "templates")
 
 @app.get("/", response_class=HTMLResponse)
 async def landing_page(request: Request):
@@ -61,9 +162,8 @@ async def landing_page(request: Request):
     
     return templates.TemplateResponse("landing.html", context)
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
+def build_health():
+    """Build the health check payload."""
     return {
         "status": "healthy",
         "version": "1.0.0",
@@ -71,9 +171,15 @@ async def health_check():
         "premium_features": True
     }
 
-@app.get("/api/v1/status")
-async def api_status():
-    """API status with premium features."""
+@app.get("/health")
+async def health_check(request: Request):
+    """Health check endpoint."""
+    body, etag = cached_json("health", STATUS_CACHE_TTL, build_health)
+    return json_response(request, body, etag, max_age=STATUS_CACHE_TTL)
+
+def build_api_status():
+    """Build the API status payload."""
+    settings = get_settings()
     return {
         "api_version": "v1",
         "status": "operational",
@@ -108,6 +214,143 @@ async def api_status():
         }
     }
 
+@app.get("/api/v1/status")
+async def api_status(request: Request):
+    """API status with premium features."""
+    body, etag = cached_json("status", STATUS_CACHE_TTL, build_api_status)
+    return json_response(request, body, etag, max_age=STATUS_CACHE_TTL)
+
+# Organization-wide symbol index fed by per-repository search indexes
+symbol_index = SearchIndex()
+
+def validate_symbols(symbols, field):
+    """Reject symbol lists that are not lists of objects with a name and string id and path."""
+    if not isinstance(symbols, list) or not all(
+        isinstance(symbol, dict)
+        and isinstance(symbol.get("name"), str)
+        and isinstance(symbol.get("id", ""), str)
+        and isinstance(symbol.get("path", ""), str)
+        for symbol in symbols
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"{field} must be a list of symbols with a name and string id and path"
+        )
+
+@app.get("/api/v1/search")
+async def search_symbols(q: str, repository: str | None = None, fuzzy: bool = True, limit: int = 20):
+    """Search symbols across every indexed repository with prefix and fuzzy matching."""
+    import asyncio
+    
+    started = time.perf_counter()
+    results = await asyncio.to_thread(
+        symbol_index.search, q, limit=max(1, min(limit, 100)), fuzzy=fuzzy, repository=repository
+    )
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+@app.put("/api/v1/search/repositories/{owner}/{name}")
+async def index_repository(owner: str, name: str, request: dict):
+    """Replace a repository's symbols in the organization index."""
+    import asyncio
+    
+    symbols = request.get("symbols")
+    validate_symbols(symbols, "symbols")
+    await asyncio.to_thread(symbol_index.add_repository, f"{owner}/{name}", symbols)
+    stats = await asyncio.to_thread(symbol_index.stats)
+    return {"repository": f"{owner}/{name}", "indexed": len(symbols), "index": stats}
+
+@app.patch("/api/v1/search/repositories/{owner}/{name}")
+async def update_repository_index(owner: str, name: str, request: dict):
+    """Add changed symbols and tombstone deleted symbol ids for a repository."""
+    import asyncio
+    
+    added = request.get("added", [])
+    deleted = request.get("deleted", [])
+    validate_symbols(added, "added")
+    if not isinstance(deleted, list) or not all(isinstance(sid, str) for sid in deleted):
+        raise HTTPException(status_code=400, detail="deleted must be a list of symbol ids")
+    await asyncio.to_thread(
+        symbol_index.update_repository, f"{owner}/{name}", added, deleted
+    )
+    stats = await asyncio.to_thread(symbol_index.stats)
+    return {
+        "repository": f"{owner}/{name}",
+        "added": len(added),
+        "deleted": len(deleted),
+        "index": stats
+    }
+
+@app.delete("/api/v1/search/repositories/{owner}/{name}")
+async def remove_repository_index(owner: str, name: str):
+    """Remove a repository from the organization index."""
+    import asyncio
+    
+    await asyncio.to_thread(symbol_index.remove_repository, f"{owner}/{name}")
+    stats = await asyncio.to_thread(symbol_index.stats)
+    return {"repository": f"{owner}/{name}", "index": stats}
+
+# Upper bound on diagrams rendered in a single request
+MAX_DIAGRAMS_PER_REQUEST = 200
+
+@app.post("/api/v1/assets/diagrams")
+async def render_diagrams(request: dict):
+    """Render class diagrams and dependency graphs, reusing cached images."""
+    import asyncio
+    
+    diagrams = request.get("diagrams")
+    if not isinstance(diagrams, list) or not diagrams:
+        raise HTTPException(status_code=400, detail="diagrams must be a non-empty list")
+    if len(diagrams) > MAX_DIAGRAMS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_DIAGRAMS_PER_REQUEST} diagrams per request"
+        )
+    if not all(isinstance(spec, dict) for spec in diagrams):
+        raise HTTPException(status_code=400, detail="Each diagram must be an object")
+    
+    import asset_cache
+    
+    try:
+        assets = await asyncio.to_thread(asset_cache.render_assets, diagrams)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asset_cache.BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Diagram renderer unavailable, try again")
+    
+    return {
+        "assets": [
+            {
+                "key": asset["key"],
+                "url": f"/api/v1/assets/{asset['key']}.{asset['format']}",
+                "cached": asset["cached"]
+            }
+            for asset in assets
+        ],
+        "rendered": sum(1 for asset in assets if not asset["cached"])
+    }
+
+@app.get("/api/v1/assets/{key}.{fmt}")
+async def get_asset(key: str, fmt: str):
+    """Serve a rendered asset; content-addressed, so it never changes."""
+    import asset_cache
+    
+    if len(key) != 64 or not all(c in "0123456789abcdef" for c in key) or fmt not in asset_cache.ASSET_FORMATS:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    path = asset_cache.asset_path(key, fmt)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return FileResponse(
+        path,
+        headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{key}"'}
+    )
+
+# Demo job store; like the symbol index, warm-pool workers share the supervisor's copy
+job_store = JobStore()
+
 # Import API routes (if they exist)
 try:
     from docify.api.generate import router as generation_router
@@ -119,64 +362,415 @@ try:
 except ImportError as e:
     print(f"⚠️  API routes not found ({e}) - running in demo mode only")
     
+    # Job records never change, so workers cache them instead of asking the
+    # shared store on every poll: job_id -> job
+    job_records = {}
+
+    # Serialized status per job id: (status, body, etag), rebuilt only on state transitions
+    job_responses = {}
+    MAX_CACHED_JOB_RESPONSES = 10_000
+
+    def remember(cache, key, value):
+        """Store value in a bounded cache, dropping the oldest entry when full."""
+        if len(cache) >= MAX_CACHED_JOB_RESPONSES:
+            # Dicts keep insertion order
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+
+    async def lookup_job(job_id):
+        """Return a job record, or None if unknown or evicted."""
+        import asyncio
+        
+        job = job_records.get(job_id)
+        if job is not None:
+            # Expire cached records when the store would evict them
+            if time.monotonic() < job["started"] + PIPELINE_SECONDS + JOB_RETENTION_SECONDS:
+                return job
+            del job_records[job_id]
+        job = await asyncio.to_thread(job_store.get_job, job_id)
+        if job is not None:
+            remember(job_records, job_id, job)
+        return job
+
+    def job_status_response(job):
+        """Return (body, etag) for a job, re-serializing only on state transitions."""
+        status, progress = job_stage(job)
+        cached = job_responses.get(job["job_id"])
+        if cached is None or cached[0] != status:
+            body = dumps_json({
+                "job_id": job["job_id"],
+                "status": status,
+                "documentation_url": job["documentation_url"],
+                "progress": progress
+            })
+            cached = (status, body, make_etag(body))
+            remember(job_responses, job["job_id"], cached)
+        return cached[1], cached[2]
+
+    def repo_name_from_url(repo_url):
+        """Extract the repository name used in demo documentation URLs."""
+        repo_name = "demo-repo"
+        if repo_url:
+            try:
+                parts = repo_url.rstrip("/").split("/")
+                if len(parts) >= 2:
+                    repo_name = parts[-1].replace(".git", "")
+            except:
+                pass
+        return repo_name
+
     # Create mock API endpoints for demo
     @app.post("/api/v1/generate")
     async def mock_generate_docs(request: dict):
         """Mock documentation generation endpoint for demo."""
-        import uuid
         import asyncio
         
         # Simulate processing delay
         await asyncio.sleep(1)
         
-        job_id = str(uuid.uuid4())[:8]
         repo_url = request.get("repository_url", "")
+        repo_name = repo_name_from_url(repo_url)
         
-        # Extract repo name for demo URL
-        repo_name = "demo-repo"
-        if repo_url:
-            try:
-                parts = repo_url.rstrip("/").split("/")
-                if len(parts) >= 2:
-                    repo_name = parts[-1].replace(".git", "")
-            except:
-                pass
+        job = await asyncio.to_thread(
+            job_store.create_job, repo_url, f"https://{repo_name}.docify.dev"
+        )
+        return {
+            "job_id": job["job_id"],
+            "status": "queued",
+            "documentation_url": job["documentation_url"],
+            "estimated_completion_seconds": seconds_until_done([job])
+        }
+    
+    def seconds_until_done(jobs):
+        """Seconds until the last of jobs finishes, counting time queued for a slot."""
+        finishes_at = max(job["started"] for job in jobs) + PIPELINE_SECONDS
+        return max(0, round(finishes_at - time.monotonic()))
+
+    # Upper bound on repositories accepted in a single batch
+    MAX_BATCH_REPOSITORIES = 500
+
+    @app.post("/api/v1/generate/batch")
+    async def mock_generate_batch(request: dict):
+        """Mock batch generation endpoint for many repositories at once."""
+        import asyncio
+        
+        repositories = request.get("repositories") or []
+        if not isinstance(repositories, list) or not repositories:
+            raise HTTPException(status_code=400, detail="repositories must be a non-empty list")
+        if len(repositories) > MAX_BATCH_REPOSITORIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_BATCH_REPOSITORIES} repositories per batch"
+            )
+        
+        # Entries are URLs or objects with a repository_url; duplicates share a job
+        urls_by_mirror = {}
+        for entry in repositories:
+            repo_url = entry.get("repository_url", "") if isinstance(entry, dict) else entry
+            if not isinstance(repo_url, str) or not repo_url.strip():
+                raise HTTPException(status_code=400, detail=f"Invalid repository entry: {entry!r}")
+            urls_by_mirror.setdefault(mirror_key(repo_url), repo_url)
+        
+        # The store queues jobs onto build slots shared with every other
+        # batch and job; one call, so a batch is a single round trip
+        entries = [
+            (repo_url, f"https://{repo_name_from_url(repo_url)}.docify.dev")
+            for repo_url in urls_by_mirror.values()
+        ]
+        batch_id, jobs = await asyncio.to_thread(job_store.create_batch, entries)
         
         return {
-            "job_id": job_id,
+            "batch_id": batch_id,
             "status": "queued",
-            "documentation_url": f"https://{repo_name}.docify.dev",
-            "estimated_completion_seconds": 30
+            "total_repositories": len(jobs),
+            "duplicates_skipped": len(repositories) - len(jobs),
+            "concurrency": BUILD_SLOTS,
+            "jobs": [
+                {
+                    "job_id": job["job_id"],
+                    "repository_url": job["repository_url"],
+                    "documentation_url": job["documentation_url"]
+                }
+                for job in jobs
+            ],
+            "estimated_completion_seconds": seconds_until_done(jobs)
         }
     
+    @app.get("/api/v1/generate/batch/{batch_id}")
+    async def mock_get_batch_status(batch_id: str, request: Request):
+        """Mock aggregate progress endpoint for a batch."""
+        import asyncio
+        
+        jobs = await asyncio.to_thread(job_store.get_batch, batch_id)
+        if jobs is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        counts = {status: 0 for status, _, _ in JOB_STAGES}
+        total_progress = 0
+        for job in jobs:
+            # Evicted jobs finished long ago
+            status, progress = job_stage(job) if job else ("success", 100)
+            counts[status] += 1
+            total_progress += progress
+        
+        if counts["success"] == len(jobs):
+            batch_status = "success"
+        elif counts["queued"] == len(jobs):
+            batch_status = "queued"
+        else:
+            batch_status = "running"
+        
+        body = dumps_json({
+            "batch_id": batch_id,
+            "status": batch_status,
+            "total_repositories": len(jobs),
+            "jobs_by_status": counts,
+            "progress": round(total_progress / len(jobs), 1)
+        })
+        return json_response(request, body, make_etag(body))
+    
     @app.get("/api/v1/generate/{job_id}")
-    async def mock_get_status(job_id: str):
+    async def mock_get_status(job_id: str, request: Request):
         """Mock job status endpoint for demo."""
-        import random
+        job = await lookup_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        body, etag = job_status_response(job)
+        return json_response(request, body, etag)
+    
+    # Size of the synthetic symbol table behind a demo job's statistics
+    DEMO_SYMBOLS_PER_JOB = 50_000
+    DEMO_LANGUAGES = ["python", "javascript", "typescript", "java", "go", "rust", "cpp"]
+    
+    def demo_symbol_table(job_id, repository_url):
+        """Synthetic symbol table for a mock job, seeded by its job id."""
+        import numpy as np
+        from build_stats import SymbolTable
+        
+        seed = int.from_bytes(hashlib.blake2b(job_id.encode(), digest_size=8).digest(), "big")
+        rng = np.random.default_rng(seed)
+        n = DEMO_SYMBOLS_PER_JOB
+        weights = rng.dirichlet(np.ones(len(DEMO_LANGUAGES)))
+        repo_name = repo_name_from_url(repository_url)
+        modules = [f"{repo_name}/module_{i}" for i in range(n // 25)]
+        return SymbolTable(
+            DEMO_LANGUAGES,
+            rng.choice(len(DEMO_LANGUAGES), size=n, p=weights),
+            modules,
+            rng.integers(0, len(modules), size=n),
+            rng.random(n) < 0.65,
+            rng.geometric(0.25, size=n),
+            rng.integers(3, 120, size=n)
+        )
+    
+    # A build's symbol table never changes, so its stats are computed once
+    @functools.lru_cache(maxsize=256)
+    def job_stats(job_id, repository_url):
+        """Compute and serialize a job's symbol statistics."""
+        from build_stats import compute_stats
+        
+        started = time.perf_counter()
+        stats = compute_stats(demo_symbol_table(job_id, repository_url))
+        stats["computed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        body = dumps_json({"job_id": job_id, **stats})
+        return body, make_etag(body)
+    
+    @app.get("/api/v1/generate/{job_id}/stats")
+    async def mock_get_stats(job_id: str, request: Request):
+        """Mock per-build symbol statistics endpoint for demo."""
         import asyncio
         
-        # Simulate processing delay
-        await asyncio.sleep(0.5)
+        job = await lookup_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        # The symbol table only exists once the build has finished
+        status, _ = job_stage(job)
+        if status != "success":
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job is {status}; statistics are available once it succeeds"
+            )
         
-        # Simulate different statuses for demo
-        statuses = ["queued", "cloning", "analyzing", "generating", "building", "success"]
-        status = random.choice(statuses)
+        body, etag = await asyncio.to_thread(job_stats, job_id, job["repository_url"])
+        return json_response(request, body, etag)
+
+def warm_up():
+    """Preload grammars, compiled templates and AI clients in this process.
+
+    Called by the warm-pool supervisor before forking so that workers share
+    the loaded state copy-on-write instead of rebuilding it per process.
+    """
+    for name in GRAMMAR_MODULES:
+        try:
+            get_language(name)
+        except Exception as e:
+            print(f"⚠️  Grammar '{name}' not preloaded: {e}")
+
+    # Jinja2 keeps compiled templates in its environment cache
+    for template_name in templates.env.list_templates():
+        templates.env.get_template(template_name)
+
+    # Only imports and configures the SDK; connections open lazily per worker
+    try:
+        get_ai_client()
+    except ImportError as e:
+        print(f"⚠️  AI client not preloaded: {e}")
+
+def use_shared_state(address, authkey):
+    """Point this worker's job store and symbol index at the supervisor's copies."""
+    global job_store, symbol_index
+    from shared_state import connect_state
+    
+    job_store, symbol_index = connect_state(address, authkey)
+
+# A worker exiting sooner than this after being forked counts as a crash
+MIN_WORKER_UPTIME_SECONDS = 5
+
+# Consecutive crashes tolerated before the warm pool gives up
+MAX_RAPID_RESTARTS = 5
+MAX_RESPAWN_DELAY_SECONDS = 30
+
+def respawn_delay(rapid_failures):
+    """Seconds to wait before re-forking after consecutive rapid worker crashes."""
+    if rapid_failures <= 0:
+        return 0
+    return min(0.5 * 2 ** (rapid_failures - 1), MAX_RESPAWN_DELAY_SECONDS)
+
+def describe_exit(status):
+    """Say how a child process ended, given its os.wait() status."""
+    import signal
+    
+    code = os.waitstatus_to_exitcode(status)
+    if code < 0:
+        return f"was killed by {signal.Signals(-code).name}"
+    return f"exited with status {code}"
+
+def run_warm_pool(workers, host="0.0.0.0", port=8000):
+    """Warm up once, then fork workers that share the listening socket.
+
+    Jobs and the symbol index live in a manager process started first, so
+    every worker sees the same state. Workers that exit are replaced, with
+    exponential backoff while they keep crashing at startup, until the
+    supervisor receives SIGINT or SIGTERM, which is forwarded to every
+    worker. Returns the process exit code.
+    """
+    import gc
+    import signal
+    import socket
+    import traceback
+
+    import uvicorn
+    from shared_state import start_state_server
+
+    # Started before binding so the manager does not inherit the socket
+    state, authkey = start_state_server(job_store, symbol_index)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+
+    warm_up()
+    # Keep the garbage collector from touching (and copying) preloaded objects
+    gc.freeze()
+
+    config = uvicorn.Config(app, log_level="info")
+    # Worker pid -> time it was forked
+    children = {}
+    stopping = False
+    exit_code = 0
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                use_shared_state(state.address, authkey)
+                uvicorn.Server(config).run(sockets=[sock])
+            except BaseException:
+                # os._exit skips the interpreter's own traceback printing
+                traceback.print_exc()
+                os._exit(1)
+            os._exit(0)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"🔥 Warm pool: forking {workers} workers from pid {os.getpid()}")
+    for _ in range(workers):
+        spawn()
+
+    rapid_failures = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if stopping:
+            continue
+        if started is None:
+            # The only other child is the shared state manager
+            print(f"❌ Shared state manager {describe_exit(status)}, stopping the warm pool")
+            exit_code = 1
+            stop(None, None)
+            continue
         
-        return {
-            "job_id": job_id,
-            "status": status,
-            "documentation_url": f"https://demo-repo.docify.dev",
-            "progress": random.randint(10, 90) if status != "success" else 100
-        }
+        if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+            rapid_failures += 1
+        else:
+            rapid_failures = 0
+        if rapid_failures > MAX_RAPID_RESTARTS:
+            print(f"❌ Worker {pid} {describe_exit(status)}; workers keep exiting at startup, stopping the warm pool")
+            exit_code = 1
+            stop(None, None)
+            continue
+        
+        delay = respawn_delay(rapid_failures)
+        print(f"⚠️  Worker {pid} {describe_exit(status)}, forking a replacement in {delay:.1f}s")
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if not stopping:
+            spawn()
+    
+    state.shutdown()
+    return exit_code
 
 def main():
     """Run the premium demo server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Docify Premium Demo Server")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="fork this many workers from a warmed-up supervisor (no auto-reload)",
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    args = parser.parse_args()
+
     print("🚀 Starting Docify Premium Demo Server...")
-    print(f"📍 Landing page: http://localhost:8000")
-    print(f"📚 API docs: http://localhost:8000/api/docs")
-    print(f"🔧 Health check: http://localhost:8000/health")
+    print(f"📍 Landing page: http://localhost:{args.port}")
+    print(f"📚 API docs: http://localhost:{args.port}/api/docs")
+    print(f"🔧 Health check: http://localhost:{args.port}/health")
     print(f"🎨 Premium features: Gemini AI, Dark theme, Rose gold accents")
     
+    settings = get_settings()
+
     # Check if Gemini API key is configured
     if settings.gemini_api_key:
         print(f"✅ Gemini AI: Configured (Key: {settings.gemini_api_key[:10]}...)")
@@ -196,10 +790,23 @@ def main():
     print("="*60 + "\n")
     
     # Run the server
+    if args.workers > 0 and hasattr(os, "fork"):
+        sys.exit(run_warm_pool(args.workers, args.host, args.port))
+
+    import uvicorn
+
+    if args.workers > 0:
+        # Without fork there is no supervisor to share jobs and the symbol
+        # index, and separate workers would each see their own copy
+        if args.workers > 1:
+            print("⚠️  Shared state needs os.fork; running a single worker")
+        uvicorn.run("premium_demo:app", host=args.host, port=args.port, workers=1)
+        return
+
     uvicorn.run(
         "premium_demo:app",
-        host="0.0.0.0",
-        port=8000,
+        host=args.host,
+        port=args.port,
         reload=True,
         log_level="info"
     )
@@ -0,0 +1,340 @@
+"""
+Organization-wide symbol search index for Docify
+Per-repository indexes are appended as immutable segments and merged in the background
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+import threading
+from operator import itemgetter
+
+# Segments allowed before a background compaction is started
+MAX_SEGMENTS = 8
+
+# Leading characters a fuzzy match must share exactly with the query
+FUZZY_PREFIX_LENGTH = 2
+
+# Live matches collected per requested result before scanning stops, so very
+# common terms and one-letter prefixes stay cheap
+CANDIDATES_PER_RESULT = 10
+
+# Splits identifiers on separators and camelCase boundaries
+TOKEN_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+def tokenize(name):
+    """Return the lowercase search terms for a symbol name."""
+    terms = {name.lower()}
+    terms.update(token.lower() for token in TOKEN_PATTERN.findall(name))
+    return terms
+
+def symbol_id(symbol):
+    """Stable id of a symbol within its repository."""
+    return symbol.get("id") or f"{symbol.get('path', '')}:{symbol['name']}"
+
+def fuzzy_matches(terms, start, end, query, max_edits):
+    """Yield (index, distance) for sorted terms[start:end] within max_edits of query.
+
+    Walks the terms like a trie: edit-distance rows for the prefix shared with
+    the previous term are reused, and once a prefix is too far from the query
+    every term starting with it is skipped with a bisect.
+    """
+    # rows[k] is the distance row for the first k characters of previous
+    rows = [list(range(len(query) + 1))]
+    previous = ""
+    index = start
+    while index < end:
+        term = terms[index]
+        common = 0
+        shared = min(len(term), len(previous), len(rows) - 1)
+        while common < shared and term[common] == previous[common]:
+            common += 1
+        del rows[common + 1:]
+        previous = term
+
+        for depth in range(common, len(term)):
+            above = rows[-1]
+            row = [above[0] + 1]
+            for j, char in enumerate(query, 1):
+                row.append(min(above[j] + 1, row[j - 1] + 1, above[j - 1] + (char != term[depth])))
+            rows.append(row)
+            if min(row) > max_edits:
+                index = bisect.bisect_left(terms, term[:depth + 1] + "\uffff", index, end)
+                break
+        else:
+            if rows[-1][-1] <= max_edits:
+                yield index, rows[-1][-1]
+            index += 1
+
+class Segment:
+    """Immutable batch of documents with a sorted term dictionary.
+
+    Documents are grouped by repository, so a repository's documents occupy
+    one contiguous range of positions and can be cut out of any sorted
+    posting list with two bisects.
+    """
+
+    def __init__(self, docs, postings=None):
+        # docs: list of (uid, repository, symbol); postings: term -> sorted positions
+        if postings is None:
+            docs = sorted(docs, key=itemgetter(1))
+            postings = {}
+            for position, (_, _, symbol) in enumerate(docs):
+                for term in tokenize(symbol["name"]):
+                    postings.setdefault(term, []).append(position)
+        self.docs = docs
+        self.terms = sorted(postings)
+        self.postings = [postings[term] for term in self.terms]
+        # repository -> (start, end) range of its document positions
+        self.repositories = {}
+        start = 0
+        for repository, group in itertools.groupby(docs, key=itemgetter(1)):
+            end = start + sum(1 for _ in group)
+            self.repositories[repository] = (start, end)
+            start = end
+
+    @classmethod
+    def merge(cls, segments, tombstones):
+        """Merge segments into one, dropping tombstoned documents.
+
+        Posting lists are remapped rather than rebuilt, so symbol names are
+        not re-tokenized. Returns (segment or None, uids dropped).
+        """
+        dropped = set()
+        kept = []
+        for index, segment in enumerate(segments):
+            for position, doc in enumerate(segment.docs):
+                if doc[0] in tombstones:
+                    dropped.add(doc[0])
+                else:
+                    kept.append((doc[1], index, position))
+        # Stable, so each repository's documents keep their relative order
+        kept.sort(key=itemgetter(0))
+
+        docs = []
+        remaps = [[None] * len(segment) for segment in segments]
+        for _, index, position in kept:
+            remaps[index][position] = len(docs)
+            docs.append(segments[index].docs[position])
+
+        postings = {}
+        for segment, remap in zip(segments, remaps):
+            for term, positions in zip(segment.terms, segment.postings):
+                moved = [remap[p] for p in positions if remap[p] is not None]
+                if moved:
+                    postings.setdefault(term, []).extend(moved)
+        for positions in postings.values():
+            positions.sort()
+        return (cls(docs, postings) if docs else None), dropped
+
+    def __len__(self):
+        return len(self.docs)
+
+    def term_range(self, prefix):
+        """Return the index range of terms starting with prefix."""
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "\uffff", start)
+        return start, end
+
+class SearchIndex:
+    """Segment-based symbol index merged across repositories.
+
+    Adding a repository appends a new segment. Replaced or deleted symbols are
+    tombstoned and dropped when segments are compacted in a background thread.
+    """
+
+    def __init__(self, max_segments=MAX_SEGMENTS):
+        self.max_segments = max_segments
+        self._segments = []
+        self._tombstones = set()
+        # repository -> {symbol id: uid of the live document}
+        self._live = {}
+        self._uids = itertools.count()
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor = None
+
+    def add_repository(self, repository, symbols):
+        """Replace every indexed symbol of a repository."""
+        self.update_repository(repository, symbols, replace=True)
+
+    def update_repository(self, repository, added=(), deleted=(), replace=False):
+        """Add or replace symbols and tombstone deleted symbol ids."""
+        with self._lock:
+            live = self._live.setdefault(repository, {})
+            if replace:
+                self._tombstones.update(live.values())
+                live.clear()
+            for sid in deleted:
+                uid = live.pop(sid, None)
+                if uid is not None:
+                    self._tombstones.add(uid)
+
+            docs = []
+            for symbol in added:
+                sid = symbol_id(symbol)
+                if sid in live:
+                    self._tombstones.add(live[sid])
+                uid = next(self._uids)
+                live[sid] = uid
+                docs.append((uid, repository, symbol))
+            if not live:
+                del self._live[repository]
+
+        if docs:
+            segment = Segment(docs)
+            with self._lock:
+                self._segments.append(segment)
+        self._maybe_compact()
+
+    def remove_repository(self, repository):
+        """Tombstone every symbol of a repository."""
+        with self._lock:
+            live = self._live.pop(repository, {})
+            self._tombstones.update(live.values())
+        self._maybe_compact()
+
+    def stats(self):
+        """Return segment, document and tombstone counts."""
+        with self._lock:
+            return {
+                "repositories": len(self._live),
+                "segments": len(self._segments),
+                "documents": sum(len(segment) for segment in self._segments),
+                "live_symbols": sum(len(live) for live in self._live.values()),
+                "tombstones": len(self._tombstones),
+            }
+
+    def _plan_compaction(self):
+        """Return the segments to merge next, or an empty list. Caller holds the lock."""
+        segments = self._segments
+        documents = sum(len(segment) for segment in segments)
+        if documents and len(self._tombstones) > documents // 2:
+            return list(segments)
+        if len(segments) <= self.max_segments:
+            return []
+        # Merge the smallest segments so large ones are rewritten rarely
+        count = len(segments) - self.max_segments // 2
+        return sorted(segments, key=len)[:count]
+
+    def _maybe_compact(self):
+        """Start a background compaction thread if one is needed and not running."""
+        with self._lock:
+            if self._compactor and self._compactor.is_alive():
+                return
+            if not self._plan_compaction():
+                return
+            self._compactor = threading.Thread(target=self._compact_loop, daemon=True)
+            self._compactor.start()
+
+    def _compact_loop(self):
+        """Keep compacting until no merge is needed."""
+        while True:
+            with self._lock:
+                merging = self._plan_compaction()
+            if not merging:
+                return
+            self.compact(merging)
+
+    def compact(self, merging=None):
+        """Merge segments (all by default) into one, dropping tombstoned documents.
+
+        Compactions run one at a time; a plan whose segments were already
+        merged by another compaction is dropped.
+        """
+        with self._compact_lock:
+            with self._lock:
+                current = {id(segment) for segment in self._segments}
+                if merging is None:
+                    merging = list(self._segments)
+                elif not all(id(segment) in current for segment in merging):
+                    return
+                tombstones = set(self._tombstones)
+
+            merged, dropped = Segment.merge(merging, tombstones)
+
+            with self._lock:
+                # Keep segments appended while this compaction was running
+                merged_ids = {id(segment) for segment in merging}
+                remaining = [s for s in self._segments if id(s) not in merged_ids]
+                self._segments = ([merged] if merged else []) + remaining
+                # A new set, so searches holding the old segments keep their tombstones
+                self._tombstones = self._tombstones - dropped
+
+    def search(self, query, limit=20, fuzzy=False, max_edits=None, repository=None):
+        """Return up to limit symbols matching query by prefix, then fuzzily.
+
+        Exact term matches rank above prefix matches, which rank above fuzzy
+        matches; ties prefer shorter symbol names. Fuzzy matches must share the
+        first FUZZY_PREFIX_LENGTH characters with the query. Scanning stops
+        once limit * CANDIDATES_PER_RESULT live matches have been collected.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        if max_edits is None:
+            max_edits = 1 if len(query) <= 5 else 2
+
+        with self._lock:
+            segments = list(self._segments)
+            tombstones = self._tombstones
+        if repository is not None:
+            segments = [s for s in segments if repository in s.repositories]
+
+        budget = limit * CANDIDATES_PER_RESULT
+        best = {}
+
+        def collect(segment, index, score):
+            """Add the term's live documents until the budget is spent."""
+            positions = segment.postings[index]
+            start, end = 0, len(positions)
+            if repository is not None:
+                first, last = segment.repositories[repository]
+                start = bisect.bisect_left(positions, first)
+                end = bisect.bisect_left(positions, last, start)
+            for i in range(start, end):
+                uid, repo, symbol = segment.docs[positions[i]]
+                if uid in tombstones:
+                    continue
+                key = (score, -len(symbol["name"]))
+                if uid in best:
+                    if best[uid][0] < key:
+                        best[uid] = (key, repo, symbol)
+                elif len(best) < budget:
+                    best[uid] = (key, repo, symbol)
+                else:
+                    return
+
+        # Exact matches first; a full page of them cannot be outranked
+        for segment in segments:
+            if len(best) >= budget:
+                break
+            index = bisect.bisect_left(segment.terms, query)
+            if index < len(segment.terms) and segment.terms[index] == query:
+                collect(segment, index, 3)
+
+        if len(best) < limit:
+            for segment in segments:
+                start, end = segment.term_range(query)
+                for index in range(start, end):
+                    if len(best) >= budget:
+                        break
+                    if segment.terms[index] != query:
+                        collect(segment, index, 2)
+
+        # Only scan for typos when prefix matching did not fill the page
+        if fuzzy and len(best) < limit and len(query) > FUZZY_PREFIX_LENGTH:
+            for segment in segments:
+                start, end = segment.term_range(query[:FUZZY_PREFIX_LENGTH])
+                for index, distance in fuzzy_matches(segment.terms, start, end, query, max_edits):
+                    if len(best) >= budget:
+                        break
+                    if distance:
+                        collect(segment, index, 1 - distance / (max_edits + 1))
+
+        top = heapq.nlargest(limit, best.values(), key=lambda item: item[0])
+        return [
+            {"repository": repo, "score": round(key[0], 3), **symbol}
+            for key, repo, symbol in top
+        ]
@@ -0,0 +1,41 @@
+"""
+Process-shared state for the premium demo warm pool
+The supervisor serves the job store and symbol index to its forked workers through a multiprocessing manager
+"""
+
+import os
+import signal
+from multiprocessing import get_context
+from multiprocessing.managers import BaseManager
+
+# Objects served by the manager process, filled in by start_state_server
+_served = {}
+
+class StateManager(BaseManager):
+    """Manager exposing the job store and symbol index to worker processes."""
+
+StateManager.register("job_store", callable=lambda: _served["job_store"])
+StateManager.register("symbol_index", callable=lambda: _served["symbol_index"])
+
+def ignore_interrupts():
+    """Leave shutdown to the supervisor when Ctrl-C reaches the process group."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def start_state_server(job_store, symbol_index):
+    """Fork a manager process that owns job_store and symbol_index.
+
+    Returns (manager, authkey); workers pass manager.address and authkey to
+    connect_state. Compaction threads of the index run in the manager process.
+    """
+    _served["job_store"] = job_store
+    _served["symbol_index"] = symbol_index
+    authkey = os.urandom(32)
+    manager = StateManager(authkey=authkey, ctx=get_context("fork"))
+    manager.start(initializer=ignore_interrupts)
+    return manager, authkey
+
+def connect_state(address, authkey):
+    """Return proxies for the supervisor's (job_store, symbol_index)."""
+    manager = StateManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.job_store(), manager.symbol_index()
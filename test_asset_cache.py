@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed diagram cache
+Covers spec validation, canonical keys, layered layout, asset size caps and pool recovery
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import asset_cache
+from asset_cache import asset_key, layered_layout, normalize_spec
+
+def spec(nodes=(), edges=(), **extra):
+    """Diagram spec for the given graph."""
+    return {"graph": {"nodes": list(nodes), "edges": [list(edge) for edge in edges]}, **extra}
+
+def test_equivalent_specs_share_a_key():
+    """Order, duplicates, integer labels and color case do not change the key."""
+    first = normalize_spec(spec(["b", "a"], [("a", "b"), ("a", "b")], style={"node_color": "#ABCDEF"}))
+    second = normalize_spec(spec(["a"], [("a", "b")], style={"node_color": "#abcdef"}))
+    assert first == second
+    assert asset_key(first) == asset_key(second)
+    assert normalize_spec(spec([1], [(1, 2)]))["graph"] == {"nodes": ["1", "2"], "edges": [["1", "2"]]}
+
+@pytest.mark.parametrize("bad", [
+    {"style": {"dpi": 0}},
+    {"style": {"dpi": "100"}},
+    {"style": {"dpi": True}},
+    {"style": {"font_size": 100}},
+    {"style": {"edge_color": "red"}},
+    {"style": {"opacity": 1}},
+    {"style": []},
+    {"format": "gif"},
+])
+def test_invalid_style_and_format_are_rejected(bad):
+    """Style values are type- and range-checked up front."""
+    with pytest.raises(ValueError):
+        normalize_spec({**spec(["a"]), **bad})
+
+@pytest.mark.parametrize("graph", [
+    {"nodes": 5},
+    {"edges": "ab"},
+    {"edges": ["ab"]},
+    {"edges": [["a", "b", "c"]]},
+    {"edges": [[["a"], "b"]]},
+    {"nodes": [None]},
+    {"nodes": [1.5]},
+    {"nodes": [""]},
+    {"nodes": ["x" * (asset_cache.MAX_LABEL_LENGTH + 1)]},
+    {"nodes": [str(i) for i in range(asset_cache.MAX_NODES + 1)]},
+    {"edges": [["a", str(i)] for i in range(asset_cache.MAX_NODES)]},
+    {"edges": [["a", "b"]] * (asset_cache.MAX_EDGES + 1)},
+])
+def test_invalid_graphs_are_rejected(graph):
+    """Malformed or oversized graphs raise ValueError instead of failing later."""
+    with pytest.raises(ValueError):
+        normalize_spec({"graph": graph})
+
+def test_layout_layers_by_longest_path():
+    """A node sits one column right of its deepest predecessor."""
+    positions = layered_layout(["a", "b", "c", "d"], [["a", "b"], ["b", "c"], ["a", "c"], ["d", "d"]])
+    assert {node: x for node, (x, _) in positions.items()} == {"a": 0, "b": 1, "c": 2, "d": 0}
+
+def test_layout_breaks_cycles_deterministically():
+    """Cycles are broken at the first node in input order and every node is placed."""
+    nodes = ["a", "b", "c", "e"]
+    edges = [["a", "b"], ["b", "c"], ["c", "a"], ["c", "e"]]
+    positions = layered_layout(nodes, edges)
+    assert {node: x for node, (x, _) in positions.items()} == {"a": 0, "b": 1, "c": 2, "e": 3}
+    assert positions == layered_layout(nodes, edges)
+
+def test_layout_handles_long_chains():
+    """Layering is linear, so long dependency chains stay cheap."""
+    nodes = [f"n{i:05d}" for i in range(20000)]
+    positions = layered_layout(nodes, [[a, b] for a, b in zip(nodes, nodes[1:])])
+    assert positions[nodes[-1]][0] == len(nodes) - 1
+
+def test_oversized_svg_is_rejected(tmp_path):
+    """SVGs above the byte cap raise instead of being cached."""
+    pytest.importorskip("matplotlib")
+    normalized = normalize_spec(spec(["a", "b"], [("a", "b")], format="svg"))
+    path = tmp_path / "diagram.svg"
+    with pytest.raises(ValueError):
+        asset_cache.render_asset(normalized, path, max_bytes=100)
+    assert list(tmp_path.iterdir()) == []
+
+    asset_cache.render_asset(normalized, path)
+    assert path.read_text().startswith("<?xml")
+
+def test_render_pool_recovers_after_a_worker_dies(tmp_path):
+    """A render process that dies breaks the pool once, not for every later request."""
+    pytest.importorskip("matplotlib")
+    executor = asset_cache.get_executor()
+    with pytest.raises(asset_cache.BrokenProcessPool):
+        executor.submit(os._exit, 1).result()
+
+    results = asset_cache.render_assets([spec(["a", "b"], [("a", "b")])], cache_dir=tmp_path)
+    assert asset_cache.get_executor() is not executor
+    assert all(Path(result["path"]).exists() for result in results)
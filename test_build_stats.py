@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-build symbol statistics
+Checks the vectorized group-bys against plain Python reference computations
+"""
+
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from build_stats import COMPLEXITY_PERCENTILES, SymbolTable, compute_stats, grouped_percentiles
+
+def nearest_rank(values, percentile):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * percentile / 100) - 1, 0)]
+
+def random_columns(n, seed=3):
+    """Per-symbol columns for a random symbol table."""
+    rng = random.Random(seed)
+    return {
+        "language": [rng.choice(["python", "go", "rust"]) for _ in range(n)],
+        "module": [f"pkg/mod{rng.randint(0, 30)}" for _ in range(n)],
+        "has_docstring": [rng.random() < 0.6 for _ in range(n)],
+        "complexity": [rng.randint(1, 40) for _ in range(n)],
+        "lines": [rng.randint(1, 200) for _ in range(n)],
+    }
+
+def test_grouped_percentiles_match_nearest_rank():
+    """Every group's percentiles equal a per-group nearest-rank computation."""
+    rng = np.random.default_rng(1)
+    codes = np.sort(rng.integers(0, 4, size=500))
+    values = rng.integers(-5, 50, size=500)
+    counts = np.bincount(codes, minlength=5)
+    percentiles = [1, 50, 90, 99, 100]
+
+    result = grouped_percentiles(codes, values, counts, percentiles)
+    for group in range(4):
+        group_values = values[codes == group].tolist()
+        assert result[group].tolist() == [nearest_rank(group_values, p) for p in percentiles]
+    # Group 4 is empty
+    assert result[4].tolist() == [0] * len(percentiles)
+
+def test_compute_stats_matches_reference():
+    """Per-language, histogram and module aggregates agree with plain Python."""
+    columns = random_columns(2000)
+    stats = compute_stats(SymbolTable.from_columns(**columns), top_modules=5)
+
+    assert stats["total_symbols"] == 2000
+    assert stats["total_modules"] == len(set(columns["module"]))
+    documented = sum(columns["has_docstring"])
+    assert stats["docstring_coverage_percent"] == round(documented / 2000 * 100, 1)
+
+    for entry in stats["by_language"]:
+        rows = [i for i, language in enumerate(columns["language"]) if language == entry["language"]]
+        complexity = [columns["complexity"][i] for i in rows]
+        assert entry["symbols"] == len(rows)
+        assert entry["lines"] == sum(columns["lines"][i] for i in rows)
+        assert entry["complexity"]["max"] == max(complexity)
+        assert entry["complexity"]["mean"] == round(sum(complexity) / len(rows), 2)
+        for p in COMPLEXITY_PERCENTILES:
+            assert entry["complexity"][f"p{p}"] == nearest_rank(complexity, p)
+    assert [e["symbols"] for e in stats["by_language"]] == sorted(
+        (e["symbols"] for e in stats["by_language"]), reverse=True
+    )
+
+    histogram = stats["complexity_distribution"]
+    assert sum(histogram.values()) == 2000
+    assert histogram["1"] == columns["complexity"].count(1)
+    assert histogram["21+"] == sum(1 for c in columns["complexity"] if c >= 21)
+
+    module_lines = {}
+    for module, lines in zip(columns["module"], columns["lines"]):
+        module_lines[module] = module_lines.get(module, 0) + lines
+    expected = sorted(module_lines.values(), reverse=True)[:5]
+    assert [m["lines"] for m in stats["largest_modules"]] == expected
+
+def test_compute_stats_on_empty_table():
+    """An empty build reports zeros instead of dividing by zero."""
+    stats = compute_stats(SymbolTable.from_columns([], [], [], [], []))
+    assert stats["total_symbols"] == 0
+    assert stats["docstring_coverage_percent"] == 0
+    assert stats["by_language"] == []
+    assert stats["largest_modules"] == []
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the mock job store
+Covers stage timelines, build slots, unknown ids, eviction and mirror key normalization
+"""
+
+from job_store import JOB_STAGES, PIPELINE_SECONDS, JobStore, job_stage, mirror_key
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_job_moves_through_stages():
+    """A job's status follows JOB_STAGES and ends in success."""
+    clock = FakeClock()
+    store = JobStore(clock=clock)
+    job = store.create_job("https://github.com/org/repo", "https://repo.docify.dev")
+
+    assert job_stage(job, clock()) == ("queued", 0)
+    assert job_stage(job, clock() + JOB_STAGES[0][2]) == ("cloning", 10)
+    assert job_stage(job, clock() + PIPELINE_SECONDS) == ("success", 100)
+
+def test_jobs_queue_for_build_slots():
+    """Jobs beyond the slot count start when the earliest slot frees up."""
+    clock = FakeClock()
+    store = JobStore(slots=2, clock=clock)
+    jobs = store.create_jobs([("https://github.com/org/repo", "https://repo.docify.dev")] * 5)
+    assert [job["started"] - clock() for job in jobs] == [
+        0, 0, PIPELINE_SECONDS, PIPELINE_SECONDS, 2 * PIPELINE_SECONDS,
+    ]
+
+def test_overlapping_batches_share_slots():
+    """A second batch and a single job queue behind the first batch."""
+    clock = FakeClock()
+    store = JobStore(slots=2, clock=clock)
+    entry = ("https://github.com/org/repo", "https://repo.docify.dev")
+    store.create_batch([entry] * 2)
+    clock.now += 5
+    _, second = store.create_batch([entry] * 2)
+    single = store.create_job(*entry)
+
+    assert [job["started"] for job in second] == [1000 + PIPELINE_SECONDS] * 2
+    assert single["started"] == 1000 + 2 * PIPELINE_SECONDS
+
+def test_idle_slots_start_jobs_immediately():
+    """Slots that freed up in the past do not backdate new jobs."""
+    clock = FakeClock()
+    store = JobStore(slots=1, clock=clock)
+    store.create_job("https://github.com/org/a", "https://a.docify.dev")
+    clock.now += 10 * PIPELINE_SECONDS
+    assert store.create_job("https://github.com/org/b", "https://b.docify.dev")["started"] == clock()
+
+def test_unknown_job_is_not_created():
+    """Looking up an unknown id returns None and stores nothing."""
+    store = JobStore(clock=FakeClock())
+    assert store.get_job("missing") is None
+    assert store.get_job("batch") is None
+    assert len(store) == 0
+
+def test_records_are_copies():
+    """Mutating a returned record does not change the store."""
+    store = JobStore(clock=FakeClock())
+    job = store.create_job("https://github.com/org/repo", "https://repo.docify.dev")
+    job["started"] = 0
+    assert store.get_job(job["job_id"])["started"] != 0
+
+def test_finished_jobs_are_evicted_after_retention():
+    """Jobs are kept while running and for the retention period after success."""
+    clock = FakeClock()
+    store = JobStore(retention=100, slots=1, clock=clock)
+    old = store.create_job("https://github.com/org/old", "https://old.docify.dev")
+    # Queued behind old and nine more jobs on the only slot
+    queued = store.create_jobs([("https://github.com/org/later", "https://later.docify.dev")] * 10)[-1]
+
+    clock.now += PIPELINE_SECONDS + 50
+    store.evict_finished()
+    assert store.get_job(old["job_id"]) is not None
+
+    clock.now += 100
+    store.evict_finished()
+    assert store.get_job(old["job_id"]) is None
+    assert store.get_job(queued["job_id"]) is not None
+
+def test_creating_jobs_sweeps_periodically():
+    """Eviction runs as a side effect of creating jobs, without a manual sweep."""
+    clock = FakeClock()
+    store = JobStore(retention=0, clock=clock)
+    for _ in range(10):
+        store.create_job("https://github.com/org/repo", "https://repo.docify.dev")
+
+    clock.now += PIPELINE_SECONDS + 3600
+    store.create_job("https://github.com/org/repo", "https://repo.docify.dev")
+    assert len(store) == 1
+
+def test_batches_report_evicted_jobs_and_expire():
+    """Batch lookups tolerate evicted jobs and the batch itself expires."""
+    clock = FakeClock()
+    store = JobStore(retention=100, slots=1, clock=clock)
+    batch_id, (first, second) = store.create_batch([
+        ("https://github.com/org/a", "https://a.docify.dev"),
+        ("https://github.com/org/b", "https://b.docify.dev"),
+    ])
+
+    clock.now += PIPELINE_SECONDS + 110
+    store.evict_finished()
+    jobs = store.get_batch(batch_id)
+    assert jobs[0] is None
+    assert jobs[1]["job_id"] == second["job_id"]
+
+    clock.now += PIPELINE_SECONDS
+    store.evict_finished()
+    assert store.get_batch(batch_id) is None
+    assert store.get_batch("missing") is None
+
+def test_mirror_key_matches_equivalent_urls():
+    """https, ssh and scp-style URLs of one repository share a key."""
+    expected = "github.com/Org/Repo"
+    for url in [
+        "https://github.com/Org/Repo",
+        "https://GitHub.com/Org/Repo.git",
+        "https://github.com/Org/Repo/",
+        "git@github.com:Org/Repo.git",
+        "ssh://git@github.com/Org/Repo.git",
+        "github.com/Org/Repo",
+        "  https://github.com/Org/Repo.git/  ",
+    ]:
+        assert mirror_key(url) == expected, url
+
+def test_mirror_key_keeps_path_case():
+    """Paths are case-sensitive on many hosts, so only the host is lowercased."""
+    assert mirror_key("https://gitlab.example.com/Team/App") != mirror_key(
+        "https://gitlab.example.com/team/app"
+    )
@@ -57,14 +57,176 @@ def test_mock_api():
             else:
                 print(f"   ❌ Status endpoint failed: {status_response.status_code}")
                 return False
+            
+            # Revalidate with the ETag; unchanged job state should return 304
+            etag = status_response.headers.get("ETag")
+            print(f"   🏷️  ETag: {etag}")
+            
+            cached_response = requests.get(
+                f"{base_url}/api/v1/generate/{job_id}",
+                headers={"If-None-Match": etag},
+                timeout=10
+            )
+            
+            if cached_response.status_code == 304:
+                print(f"   ✅ Conditional request returned 304 Not Modified")
+            elif cached_response.status_code == 200 and cached_response.headers.get("ETag") != etag:
+                print(f"   ✅ Job changed state, new ETag: {cached_response.headers.get('ETag')}")
+            else:
+                print(f"   ❌ ETag revalidation failed: {cached_response.status_code}")
+                return False
                 
         else:
             print(f"   ❌ Generate endpoint failed: {response.status_code}")
             print(f"   📝 Response: {response.text}")
             return False
         
+        # Test batch generation endpoint
+        print(f"\n3. Testing /api/v1/generate/batch endpoint...")
+        
+        batch_data = {
+            "repositories": [
+                "https://github.com/example/test-repo",
+                {"repository_url": "https://github.com/example/other-repo"},
+                "https://github.com/example/test-repo.git"
+            ]
+        }
+        
+        batch_response = requests.post(
+            f"{base_url}/api/v1/generate/batch",
+            json=batch_data,
+            timeout=10
+        )
+        
+        if batch_response.status_code == 200:
+            batch_result = batch_response.json()
+            print(f"   ✅ Batch endpoint working")
+            print(f"   📋 Batch ID: {batch_result.get('batch_id')}")
+            print(f"   📦 Repositories: {batch_result.get('total_repositories')}")
+            print(f"   🔁 Duplicates skipped: {batch_result.get('duplicates_skipped')}")
+            
+            batch_id = batch_result.get('batch_id')
+            batch_status = requests.get(
+                f"{base_url}/api/v1/generate/batch/{batch_id}",
+                timeout=10
+            )
+            
+            if batch_status.status_code == 200:
+                print(f"   ✅ Batch status endpoint working")
+                print(f"   📈 Progress: {batch_status.json().get('progress')}")
+            else:
+                print(f"   ❌ Batch status endpoint failed: {batch_status.status_code}")
+                return False
+        else:
+            print(f"   ❌ Batch endpoint failed: {batch_response.status_code}")
+            print(f"   📝 Response: {batch_response.text}")
+            return False
+        
+        # Test organization-wide search
+        print(f"\n4. Testing /api/v1/search endpoint...")
+        
+        index_data = {
+            "symbols": [
+                {"name": "RepositoryCloner", "kind": "class", "path": "docify/clone.py"},
+                {"name": "parse_repository_url", "kind": "function", "path": "docify/urls.py"}
+            ]
+        }
+        
+        index_response = requests.put(
+            f"{base_url}/api/v1/search/repositories/example/test-repo",
+            json=index_data,
+            timeout=10
+        )
+        
+        if index_response.status_code != 200:
+            print(f"   ❌ Repository indexing failed: {index_response.status_code}")
+            return False
+        print(f"   ✅ Indexed {index_response.json().get('indexed')} symbols")
+        
+        for query, fuzzy in [("repo", False), ("clonr", True)]:
+            search_response = requests.get(
+                f"{base_url}/api/v1/search",
+                params={"q": query, "fuzzy": fuzzy},
+                timeout=10
+            )
+            
+            if search_response.status_code == 200 and search_response.json().get("results"):
+                search_result = search_response.json()
+                names = [r.get("name") for r in search_result["results"]]
+                print(f"   ✅ '{query}' -> {names} ({search_result.get('took_ms')}ms)")
+            else:
+                print(f"   ❌ Search for '{query}' failed: {search_response.status_code}")
+                return False
+        
+        # Test diagram rendering and the content-addressed cache
+        print(f"\n5. Testing /api/v1/assets/diagrams endpoint...")
+        
+        diagram_data = {
+            "diagrams": [
+                {
+                    "graph": {
+                        "nodes": ["api", "cloner", "parser", "generator"],
+                        "edges": [["api", "cloner"], ["cloner", "parser"], ["parser", "generator"]]
+                    },
+                    "format": "png"
+                }
+            ]
+        }
+        
+        for attempt in ("first", "second"):
+            diagram_response = requests.post(
+                f"{base_url}/api/v1/assets/diagrams",
+                json=diagram_data,
+                timeout=30
+            )
+            
+            if diagram_response.status_code != 200:
+                print(f"   ❌ Diagram rendering failed: {diagram_response.status_code}")
+                print(f"   📝 Response: {diagram_response.text}")
+                return False
+            asset = diagram_response.json()["assets"][0]
+            print(f"   ✅ {attempt.capitalize()} request: cached={asset.get('cached')}")
+        
+        if not asset.get("cached"):
+            print(f"   ❌ Second render was not served from the cache")
+            return False
+        
+        image_response = requests.get(f"{base_url}{asset['url']}", timeout=10)
+        if image_response.status_code == 200:
+            print(f"   ✅ Asset served: {len(image_response.content)} bytes")
+        else:
+            print(f"   ❌ Asset download failed: {image_response.status_code}")
+            return False
+        
+        # Test per-build statistics
+        print(f"\n6. Testing /api/v1/generate/{job_id}/stats endpoint...")
+        
+        stats_response = requests.get(
+            f"{base_url}/api/v1/generate/{job_id}/stats",
+            timeout=10
+        )
+        
+        if stats_response.status_code == 200:
+            stats_result = stats_response.json()
+            print(f"   ✅ Stats endpoint working")
+            print(f"   🔢 Symbols: {stats_result.get('total_symbols')}")
+            print(f"   📝 Docstring coverage: {stats_result.get('docstring_coverage_percent')}%")
+            print(f"   🗣️  Languages: {[l.get('language') for l in stats_result.get('by_language', [])]}")
+            print(f"   ⏱️  Computed in: {stats_result.get('computed_ms')}ms")
+        elif stats_response.status_code == 409:
+            # The demo job is still running; stats appear once it succeeds
+            print(f"   ✅ Stats deferred until the build succeeds: {stats_response.json().get('detail')}")
+        else:
+            print(f"   ❌ Stats endpoint failed: {stats_response.status_code}")
+            return False
+        
+        missing_response = requests.get(f"{base_url}/api/v1/generate/missing/stats", timeout=10)
+        if missing_response.status_code != 404:
+            print(f"   ❌ Unknown job returned {missing_response.status_code} instead of 404")
+            return False
+        
         # Test the landing page with form submission simulation
-        print(f"\n3. Testing landing page form simulation...")
+        print(f"\n7. Testing landing page form simulation...")
         
         # This simulates what happens when user clicks "Generate Docs"
         print("   🎯 Simulating user clicking 'Generate Docs' button...")
@@ -77,6 +239,11 @@ def test_mock_api():
         print("   • Mock API endpoints are working correctly")
         print("   • Generate documentation endpoint: ✅")
         print("   • Job status tracking endpoint: ✅")
+        print("   • Job status ETag revalidation: ✅")
+        print("   • Batch generation endpoint: ✅")
+        print("   • Organization-wide search: ✅")
+        print("   • Cached diagram rendering: ✅")
+        print("   • Per-build symbol statistics: ✅")
         print("   • Premium demo is fully functional")
         print("   • UI will show realistic responses and animations")
         
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the premium demo's pre-serialized responses
+Covers ETag revalidation, status payload TTLs and job status ETags across state transitions
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import job_store
+import premium_demo
+from job_store import JOB_STAGES, JobStore
+
+mock_mode = pytest.mark.skipif(
+    not hasattr(premium_demo, "lookup_job"), reason="docify API routes replace the demo endpoints"
+)
+
+class FakeTime:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+@pytest.fixture
+def client():
+    return TestClient(premium_demo.app)
+
+def test_matching_etag_returns_304(client):
+    """A matching If-None-Match, weak or in a list, answers 304 without a body."""
+    response = client.get("/health")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.json()["status"]
+
+    for header in [etag, f"W/{etag}", f'"other", {etag}', "*"]:
+        revalidated = client.get("/health", headers={"If-None-Match": header})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+    assert client.get("/health", headers={"If-None-Match": '"other"'}).status_code == 200
+
+def test_status_payload_is_reused_for_its_ttl(monkeypatch):
+    """cached_json rebuilds a payload only once its TTL has expired."""
+    fake_time = FakeTime()
+    monkeypatch.setattr(premium_demo, "time", fake_time)
+    builds = []
+
+    def build():
+        builds.append(fake_time.now)
+        return {"build": len(builds)}
+
+    first = premium_demo.cached_json("test-ttl", 5, build)
+    fake_time.now += 4.9
+    assert premium_demo.cached_json("test-ttl", 5, build) == first
+    fake_time.now += 0.2
+    second = premium_demo.cached_json("test-ttl", 5, build)
+    assert second != first
+    assert len(builds) == 2
+
+def test_status_endpoint_allows_client_caching(client):
+    """/api/v1/status advertises the cache TTL and a stable ETag."""
+    first = client.get("/api/v1/status")
+    second = client.get("/api/v1/status")
+    assert first.headers["cache-control"] == f"max-age={premium_demo.STATUS_CACHE_TTL}"
+    assert first.headers["etag"] == second.headers["etag"]
+
+@mock_mode
+def test_job_etag_changes_only_on_state_transitions(client, monkeypatch):
+    """A job's ETag is stable within a stage and changes when the stage does."""
+    fake_time = FakeTime()
+    monkeypatch.setattr(job_store, "time", fake_time)
+    monkeypatch.setattr(premium_demo, "job_store", JobStore(clock=fake_time.monotonic))
+    job = premium_demo.job_store.create_job("https://github.com/org/app", "https://app.docify.dev")
+    url = f"/api/v1/generate/{job['job_id']}"
+
+    queued = client.get(url)
+    assert queued.json()["status"] == "queued"
+    fake_time.now += JOB_STAGES[0][2] / 2
+    assert client.get(url).headers["etag"] == queued.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": queued.headers["etag"]}).status_code == 304
+
+    fake_time.now += JOB_STAGES[0][2]
+    cloning = client.get(url, headers={"If-None-Match": queued.headers["etag"]})
+    assert cloning.status_code == 200
+    assert cloning.json()["status"] == "cloning"
+    assert cloning.headers["etag"] != queued.headers["etag"]
+
+@mock_mode
+def test_unknown_job_and_batch_return_404(client):
+    """Polling ids that were never created does not create them."""
+    assert client.get("/api/v1/generate/missing").status_code == 404
+    assert client.get("/api/v1/generate/batch/missing").status_code == 404
+    assert client.get("/api/v1/generate/batch").status_code == 404
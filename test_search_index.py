@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the organization-wide symbol search index
+Covers tombstones, compaction, repository filters and prefix and fuzzy matching
+"""
+
+import random
+import threading
+
+from search_index import SearchIndex, Segment, fuzzy_matches, tokenize
+
+def names(results):
+    """Symbol names of search results, in ranking order."""
+    return [result["name"] for result in results]
+
+def symbols(*names, path="src/app.py"):
+    """Symbol dicts for the given names."""
+    return [{"name": name, "path": path} for name in names]
+
+def test_tokenize_splits_identifiers():
+    """Names are split on separators, camelCase and digits, and kept whole."""
+    assert tokenize("parseHTTPResponse") == {"parsehttpresponse", "parse", "http", "response"}
+    assert tokenize("get_user_v2") == {"get_user_v2", "get", "user", "v", "2"}
+
+def levenshtein(a, b):
+    """Plain edit distance, as a reference for fuzzy_matches."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def test_fuzzy_matches_agrees_with_edit_distance():
+    """The pruned trie walk finds exactly the terms a full scan would."""
+    rng = random.Random(7)
+    terms = sorted({"".join(rng.choices("abcd", k=rng.randint(1, 7))) for _ in range(3000)})
+    for query in ["abc", "dacb", "aaaaaa", "b"]:
+        for max_edits in (1, 2):
+            expected = [
+                (i, levenshtein(query, term)) for i, term in enumerate(terms)
+                if levenshtein(query, term) <= max_edits
+            ]
+            assert list(fuzzy_matches(terms, 0, len(terms), query, max_edits)) == expected
+
+def test_fuzzy_matches_respects_range():
+    """Only terms inside [start, end) are considered."""
+    terms = sorted(["parse", "parser", "prase", "purse", "pause"])
+    assert [terms[i] for i, _ in fuzzy_matches(terms, 1, 3, "parse", 1)] == ["parser", "pause"]
+
+def test_ranking_prefers_exact_then_prefix_then_fuzzy():
+    """Exact term matches outrank prefix matches, which outrank typos."""
+    index = SearchIndex()
+    index.add_repository("org/a", symbols("loader", "load", "loam"))
+    results = index.search("load", fuzzy=True)
+    assert names(results) == ["load", "loader", "loam"]
+    assert names(index.search("load", fuzzy=False)) == ["load", "loader"]
+
+def test_replaced_and_deleted_symbols_are_hidden_before_compaction():
+    """Tombstones hide stale documents while their segments still exist."""
+    index = SearchIndex(max_segments=100)
+    index._maybe_compact = lambda: None
+    index.add_repository("org/a", symbols("parseConfig", "parseArgs"))
+    index.update_repository("org/a", added=[{"name": "parseConfig", "path": "src/app.py", "kind": "v2"}],
+                            deleted=["src/app.py:parseArgs"])
+
+    results = index.search("parse")
+    assert names(results) == ["parseConfig"]
+    assert results[0]["kind"] == "v2"
+    assert index.stats()["tombstones"] == 2
+
+    index.add_repository("org/a", symbols("render"))
+    assert index.search("parse") == []
+    index.remove_repository("org/a")
+    assert index.search("render") == []
+
+def test_common_term_in_other_repository_is_found():
+    """A repository filter is not starved by a very common term elsewhere."""
+    index = SearchIndex()
+    index.add_repository("org/a", [{"name": "get_x", "id": str(i)} for i in range(2000)])
+    index.add_repository("org/b", symbols("get_x"))
+    index.compact()
+
+    results = index.search("get_x", repository="org/b")
+    assert [(r["repository"], r["name"]) for r in results] == [("org/b", "get_x")]
+    assert index.search("get_x", repository="org/missing") == []
+
+def test_tombstoned_postings_do_not_hide_live_matches():
+    """Deleted documents at the head of a posting list are skipped, not counted."""
+    index = SearchIndex(max_segments=100)
+    index._maybe_compact = lambda: None
+    index.add_repository("org/a", [{"name": "load", "id": str(i)} for i in range(3000)])
+    index.update_repository("org/a", deleted=[str(i) for i in range(1200)])
+    assert index.stats()["segments"] == 1
+
+    assert len(index.search("load", limit=20)) == 20
+    assert len(index.search("lo", limit=100)) == 100
+
+def test_partial_compaction_merges_smallest_segments():
+    """Past max_segments the smallest segments are merged and large ones kept."""
+    index = SearchIndex(max_segments=4)
+    index._maybe_compact = lambda: None
+    index.add_repository("org/big", [{"name": f"big{i}"} for i in range(100)])
+    for i in range(6):
+        index.add_repository(f"org/r{i}", symbols(f"small{i}"))
+
+    plan = index._plan_compaction()
+    assert len(plan) == 5
+    assert all(len(segment) == 1 for segment in plan)
+
+    index.compact(plan)
+    assert sorted(len(segment) for segment in index._segments) == [1, 5, 100]
+    assert len(names(index.search("small"))) == 6
+
+def test_full_compaction_drops_tombstones():
+    """When tombstones outnumber half the documents everything is rewritten."""
+    index = SearchIndex(max_segments=100)
+    index._maybe_compact = lambda: None
+    index.add_repository("org/a", symbols("alpha", "beta", "gamma"))
+    index.add_repository("org/a", symbols("delta"))
+    assert index._plan_compaction() == index._segments
+
+    index.compact(index._plan_compaction())
+    assert index.stats() == {
+        "repositories": 1, "segments": 1, "documents": 1, "live_symbols": 1, "tombstones": 0,
+    }
+    assert names(index.search("delta")) == ["delta"]
+
+def test_merged_segments_group_repositories():
+    """Merging keeps each repository's documents contiguous with sorted postings."""
+    first = Segment([(0, "org/b", {"name": "run"}), (1, "org/b", {"name": "stop"})])
+    second = Segment([(2, "org/a", {"name": "run"}), (3, "org/c", {"name": "runner"})])
+    merged, dropped = Segment.merge([first, second], tombstones={1})
+
+    assert dropped == {1}
+    assert [doc[1] for doc in merged.docs] == ["org/a", "org/b", "org/c"]
+    assert merged.repositories == {"org/a": (0, 1), "org/b": (1, 2), "org/c": (2, 3)}
+    for positions in merged.postings:
+        assert positions == sorted(positions)
+
+def test_segments_appended_during_compaction_are_kept():
+    """A segment added while a merge runs survives the swap, as do new tombstones."""
+    index = SearchIndex(max_segments=100)
+    index._maybe_compact = lambda: None
+    index.add_repository("org/a", symbols("alpha"))
+    index.add_repository("org/b", symbols("beta"))
+    merging = list(index._segments)
+
+    # Simulates writes that land between planning and swapping in the merge
+    index.add_repository("org/c", symbols("gamma"))
+    index.update_repository("org/a", deleted=["src/app.py:alpha"])
+    index.compact(merging)
+
+    assert len(index._segments) == 2
+    assert index.search("alpha") == []
+    assert names(index.search("beta")) == ["beta"]
+    assert names(index.search("gamma")) == ["gamma"]
+
+def test_overlapping_compactions_do_not_duplicate_documents():
+    """An explicit compaction racing a background one leaves each document once."""
+    index = SearchIndex(max_segments=100)
+    index._maybe_compact = lambda: None
+    for i in range(6):
+        index.add_repository(f"org/r{i}", [{"name": f"item{j}"} for j in range(200)])
+    stale_plan = list(index._segments[:3])
+
+    threads = [
+        threading.Thread(target=index.compact),
+        threading.Thread(target=index.compact, args=(stale_plan,)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = index.stats()
+    assert stats["documents"] == stats["live_symbols"] == 1200
+
+def test_concurrent_updates_and_searches():
+    """Background compaction under concurrent writers never loses live symbols."""
+    index = SearchIndex(max_segments=2)
+    errors = []
+
+    def writer(repo):
+        try:
+            for version in range(30):
+                index.add_repository(repo, [{"name": f"handler{i}", "id": str(i)} for i in range(20)])
+                index.update_repository(repo, deleted=[str(version % 20)])
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(200):
+                for result in index.search("handler", limit=50):
+                    assert result["name"].startswith("handler")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(f"org/r{i}",)) for i in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+    index.compact()
+    assert index.stats()["live_symbols"] == 4 * 19
+    for i in range(4):
+        assert len(index.search("handler", limit=100, repository=f"org/r{i}")) == 19
+
+def test_fuzzy_tier():
+    """Typos match within the edit bound and must share the leading characters."""
+    index = SearchIndex()
+    index.add_repository("org/a", symbols("serialize", "serializer", "deserialize"))
+
+    assert names(index.search("serailize", fuzzy=True)) == ["serialize"]
+    assert index.search("serailize", fuzzy=False) == []
+    # The first FUZZY_PREFIX_LENGTH characters must match exactly
+    assert index.search("esrialize", fuzzy=True) == []
+    assert names(index.search("serialise", fuzzy=True, max_edits=1)) == ["serialize"]
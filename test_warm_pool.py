@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the premium demo warm worker pool
+Starts the supervisor, checks workers share state, kills a worker and checks it is replaced and shut down cleanly
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+psutil = pytest.importorskip("psutil")
+
+import premium_demo
+
+project_root = Path(__file__).parent
+
+def free_port():
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(condition, timeout=20):
+    """Poll condition until it returns a truthy value or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(0.2)
+    raise AssertionError("condition not met before timeout")
+
+def pool_workers(process, port):
+    """Children of the supervisor holding the listening socket, i.e. not the state manager."""
+    workers = []
+    for child in process.children():
+        try:
+            if any(conn.laddr and conn.laddr.port == port for conn in child.net_connections("tcp")):
+                workers.append(child)
+        except psutil.NoSuchProcess:
+            pass
+    return workers
+
+def request_json(port, path, method="GET", payload=None):
+    """Send a request with a fresh connection and return (status, body)."""
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}",
+        data=json.dumps(payload).encode() if payload is not None else None,
+        headers={"Content-Type": "application/json"},
+        method=method,
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def health_ok(port):
+    """Return True if /health answers 200."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+def test_respawn_delay_backs_off():
+    """Backoff starts at zero, doubles per rapid crash and is capped."""
+    assert premium_demo.respawn_delay(0) == 0
+    assert premium_demo.respawn_delay(1) == 0.5
+    assert premium_demo.respawn_delay(3) == 2
+    assert premium_demo.respawn_delay(100) == premium_demo.MAX_RESPAWN_DELAY_SECONDS
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="warm pool needs os.fork")
+def test_describe_exit_reports_status_and_signal():
+    """Exit codes and killing signals from os.wait() are spelled out."""
+    pid = os.fork()
+    if pid == 0:
+        os._exit(3)
+    assert premium_demo.describe_exit(os.waitpid(pid, 0)[1]) == "exited with status 3"
+
+    pid = os.fork()
+    if pid == 0:
+        time.sleep(60)
+        os._exit(0)
+    os.kill(pid, signal.SIGKILL)
+    assert premium_demo.describe_exit(os.waitpid(pid, 0)[1]) == "was killed by SIGKILL"
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="warm pool needs os.fork")
+def test_warm_pool_replaces_workers_and_stops_cleanly():
+    """A killed worker is re-forked and SIGTERM stops the whole pool."""
+    port = free_port()
+    supervisor = subprocess.Popen(
+        [sys.executable, "premium_demo.py", "--workers", "2", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        process = psutil.Process(supervisor.pid)
+        workers = wait_for(lambda: len(pool_workers(process, port)) >= 2 and pool_workers(process, port))
+        wait_for(lambda: health_ok(port))
+
+        killed = workers[0].pid
+        os.kill(killed, signal.SIGKILL)
+        wait_for(lambda: killed not in {w.pid for w in pool_workers(process, port)}
+                 and len(pool_workers(process, port)) >= 2)
+        assert health_ok(port)
+
+        workers = process.children()
+        supervisor.send_signal(signal.SIGTERM)
+        assert supervisor.wait(timeout=20) == 0
+        assert not any(worker.is_running() and worker.status() != psutil.STATUS_ZOMBIE
+                       for worker in workers)
+    finally:
+        if supervisor.poll() is None:
+            supervisor.kill()
+            supervisor.wait()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="warm pool needs os.fork")
+def test_warm_pool_workers_share_jobs_and_search_index():
+    """Writes through one worker are visible from every worker."""
+    port = free_port()
+    supervisor = subprocess.Popen(
+        [sys.executable, "premium_demo.py", "--workers", "3", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        process = psutil.Process(supervisor.pid)
+        wait_for(lambda: len(pool_workers(process, port)) >= 3)
+        wait_for(lambda: health_ok(port))
+
+        status, body = request_json(port, "/api/v1/search/repositories/org/app", "PUT",
+                                    {"symbols": [{"name": "parseConfig", "path": "app.py"}]})
+        assert status == 200
+        status, body = request_json(port, "/api/v1/generate/batch", "POST",
+                                    {"repositories": ["https://github.com/org/app"]})
+        assert status == 200
+        job_id, batch_id = body["jobs"][0]["job_id"], body["batch_id"]
+
+        # Fresh connections are spread across workers by the kernel
+        for _ in range(20):
+            status, body = request_json(port, "/api/v1/search?q=parse")
+            assert [r["name"] for r in body["results"]] == ["parseConfig"]
+            assert request_json(port, f"/api/v1/generate/{job_id}")[0] == 200
+            assert request_json(port, f"/api/v1/generate/batch/{batch_id}")[0] == 200
+        assert request_json(port, "/api/v1/generate/unknown")[0] == 404
+    finally:
+        supervisor.send_signal(signal.SIGTERM)
+        try:
+            supervisor.wait(timeout=20)
+        except subprocess.TimeoutExpired:
+            supervisor.kill()
+            supervisor.wait()